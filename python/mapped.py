@@ -0,0 +1,142 @@
+"""
+mapped.py
+
+DNA Sequence Comparator
+Shared helpers for comparing memory-mapped files with libc memcmp,
+chunk by chunk from a thread pool or window by window.
+
+Imported by the comparison scripts in this directory; not a command-line
+tool itself.
+"""
+
+import ctypes
+import ctypes.util
+import mmap
+from contextlib import ExitStack, contextmanager
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # fall back to bytes comparison
+
+
+def load_libc():
+    path = ctypes.util.find_library("c")
+    if path is None:
+        return None  # no C runtime found, callers compare slices instead
+
+    libc = ctypes.CDLL(path)
+    libc.memcmp.argtypes = (ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t)
+    libc.memcmp.restype = ctypes.c_int
+    return libc
+
+
+libc = load_libc()
+
+
+class Py_buffer(ctypes.Structure):
+    _fields_ = [
+        ("buf", ctypes.c_void_p),
+        ("obj", ctypes.c_void_p),
+        ("len", ctypes.c_ssize_t),
+        ("itemsize", ctypes.c_ssize_t),
+        ("readonly", ctypes.c_int),
+        ("ndim", ctypes.c_int),
+        ("format", ctypes.c_char_p),
+        ("shape", ctypes.c_void_p),
+        ("strides", ctypes.c_void_p),
+        ("suboffsets", ctypes.c_void_p),
+        ("internal", ctypes.c_void_p),
+    ]
+
+
+PyBUF_SIMPLE = 0
+
+_get_buffer = ctypes.pythonapi.PyObject_GetBuffer
+_get_buffer.argtypes = (ctypes.py_object, ctypes.POINTER(Py_buffer), ctypes.c_int)
+_get_buffer.restype = ctypes.c_int
+
+_release_buffer = ctypes.pythonapi.PyBuffer_Release
+_release_buffer.argtypes = (ctypes.POINTER(Py_buffer),)
+_release_buffer.restype = None
+
+
+@contextmanager
+def mapped_address(mm):
+    # Base address of an mmap, read-only (ACCESS_READ) mappings included.
+    # The buffer export is held until exit, so exit before closing mm.
+    view = Py_buffer()
+    _get_buffer(mm, ctypes.byref(view), PyBUF_SIMPLE)  # raises on failure
+    try:
+        yield view.buf
+    finally:
+        _release_buffer(ctypes.byref(view))
+
+
+# Sub-block compared at a time, small enough that the bytes just faulted
+# in are still in L2 when compared
+SUBBLOCK_SIZE = 64 * 1024
+
+
+@contextmanager
+def map_files(file1, file2):
+    # Read-only shared mappings: nothing is charged against commit memory,
+    # so files larger than RAM map fine. Leaving the block releases the
+    # address exports and then closes the mappings.
+    with ExitStack() as stack:
+        maps = []
+        for path in (file1, file2):
+            with open(path, "rb") as f:
+                maps.append(stack.enter_context(
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)))
+
+        addrs = tuple(stack.enter_context(mapped_address(mm)) for mm in maps)
+        yield tuple(maps), addrs
+
+
+def range_equal(mm1, mm2, start, end):
+    for pos in range(start, end, SUBBLOCK_SIZE):
+        stop = min(pos + SUBBLOCK_SIZE, end)
+        tail = pos
+
+        if np is not None:
+            # Zero-copy uint64 views over the mappings, compared with SIMD;
+            # the sub-word tail is compared as bytes.
+            words = (stop - pos) // 8
+            a = np.frombuffer(mm1, dtype=np.uint64, count=words, offset=pos)
+            b = np.frombuffer(mm2, dtype=np.uint64, count=words, offset=pos)
+            if not np.array_equal(a, b):
+                return False
+            tail += words * 8
+
+        if mm1[tail:stop] != mm2[tail:stop]:
+            return False
+
+    return True
+
+
+def compare_chunk(maps, addrs, mismatch, start, size):
+    mm1, mm2 = maps
+
+    # Another thread already found a difference, skip the I/O
+    if mismatch.is_set():
+        return False
+
+    # Queue readahead for both ranges before faulting in either, so the
+    # two reads are in flight together instead of back to back.
+    if hasattr(mmap, "MADV_WILLNEED"):
+        mm1.madvise(mmap.MADV_WILLNEED, start, size)
+        mm2.madvise(mmap.MADV_WILLNEED, start, size)
+
+    if libc is not None:
+        # memcmp straight over the mapped pages: no copies, it stops at
+        # the first differing byte, and ctypes drops the GIL for the call
+        addr1, addr2 = addrs
+        equal = libc.memcmp(addr1 + start, addr2 + start, size) == 0
+    else:
+        equal = range_equal(mm1, mm2, start, start + size)
+
+    if not equal:
+        mismatch.set()
+
+    return equal
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+pack_dna.py
+
+DNA Sequence Comparator
+Offline 2-bit packing of DNA sequence files (A=00, C=01, G=10, T=11).
+
+Packing stores four bases per byte, so every comparison or hash run on
+the packed files touches a quarter of the bytes. Two sequences are equal
+exactly when their packed files are equal, so the existing comparators
+can be pointed at the packed output directly.
+
+Only A, C, G and T can be packed: N and every other byte are rejected,
+since two bits leave no code for a fifth symbol. A single trailing
+newline (LF or CRLF) at the end of the input is ignored.
+
+Packed layout:
+    4 bytes   magic b"DNA2"
+    8 bytes   base count (little-endian uint64)
+    n bytes   packed bases, first base in the high bits, last byte
+              zero-padded
+
+Usage:
+    python pack_dna.py <input_file> <output_file> [chunk_size_mb]
+
+Example:
+    python pack_dna.py dna1.txt dna1.2bit 16
+
+Default chunk size: 8 MB
+"""
+
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+MAGIC = b"DNA2"
+
+# Base -> 2-bit code; 255 marks bytes outside the A/C/G/T alphabet
+CODES = np.full(256, 255, dtype=np.uint8)
+for code, base in enumerate(b"ACGT"):
+    CODES[base] = code
+
+
+def pack_chunk(data):
+    codes = CODES[np.frombuffer(data, dtype=np.uint8)]
+
+    invalid = np.flatnonzero(codes == 255)
+    if invalid.size:
+        raise ValueError(f"invalid base {data[invalid[0]:invalid[0] + 1]!r}",
+                         int(invalid[0]))
+
+    padding = -codes.size % 4
+    if padding:
+        codes = np.concatenate([codes, np.zeros(padding, dtype=np.uint8)])
+
+    groups = codes.reshape(-1, 4)
+    packed = ((groups[:, 0] << 6) | (groups[:, 1] << 4)
+              | (groups[:, 2] << 2) | groups[:, 3])
+
+    return packed.tobytes()
+
+
+def trailing_newline(f):
+    # Length of the "\n" or "\r\n" most editors append at end of file
+    size = os.fstat(f.fileno()).st_size
+    f.seek(max(0, size - 2))
+    tail = f.read()
+    f.seek(0)
+
+    if tail.endswith(b"\r\n"):
+        return 2
+    if tail.endswith(b"\n"):
+        return 1
+    return 0
+
+
+def pack_dna(input_path, output_path, chunk_size_bytes):
+    # Whole groups of four bases per chunk, so only the last one pads
+    chunk_size_bytes = max(4, chunk_size_bytes - chunk_size_bytes % 4)
+    bases = 0
+
+    with open(input_path, "rb") as fin, open(output_path, "wb") as fout:
+        fout.write(MAGIC + struct.pack("<Q", 0))
+
+        remaining = os.fstat(fin.fileno()).st_size - trailing_newline(fin)
+        while remaining > 0:
+            data = fin.read(min(chunk_size_bytes, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+
+            try:
+                fout.write(pack_chunk(data))
+            except ValueError as e:
+                message, offset = e.args
+                raise ValueError(f"{message} at offset {bases + offset}")
+
+            bases += len(data)
+
+        fout.seek(len(MAGIC))
+        fout.write(struct.pack("<Q", bases))
+
+    return bases
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python pack_dna.py <input_file> <output_file> [chunk_size_mb]")
+        sys.exit(1)
+
+    input_path = sys.argv[1]
+    output_path = sys.argv[2]
+
+    chunk_size_mb = 8
+    if len(sys.argv) >= 4:
+        chunk_size_mb = int(sys.argv[3])
+
+    chunk_size_bytes = chunk_size_mb * 1024 * 1024
+
+    start_time = time.perf_counter()
+    try:
+        bases = pack_dna(input_path, output_path, chunk_size_bytes)
+    except ValueError as e:
+        os.remove(output_path)
+        print(f"Error: {input_path}: {e}")
+        sys.exit(1)
+    end_time = time.perf_counter()
+
+    print("========================================")
+    print("DNA Sequence Comparator")
+    print("----------------------------------------")
+    print(f"Input File : {input_path}")
+    print(f"Output File: {output_path}")
+    print(f"Bases Packed: {bases}")
+    print(f"Packed Size: {os.path.getsize(output_path) / (1024*1024):.2f} MB")
+    print("----------------------------------------")
+    print(f"Time Elapsed: {end_time - start_time:.6f} seconds")
+    print("========================================")
+
+
+if __name__ == "__main__":
+    main()
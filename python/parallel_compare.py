@@ -3,7 +3,8 @@
 parallel_compare.py
 
 DNA Sequence Comparator
-Parallel file equality testing using multiprocessing.
+Parallel file equality testing using a thread pool over memory-mapped
+files; the per-chunk memcmp runs without the GIL.
 
 Usage:
     python parallel_compare.py <file1> <file2> [chunk_size_mb]
@@ -11,44 +12,167 @@ Usage:
 Example:
     python parallel_compare.py dna1.txt dna2.txt 16
 
-Default chunk size: 8 MB
+Default chunk size: auto-tuned per storage device by a short read probe,
+cached in ~/.cache/dnacmp_tuned.json
 """
 
+import json
+import mmap
 import os
 import sys
+import threading
 import time
-from multiprocessing import Pool, cpu_count
-
-
-def compare_chunk(args):
-    file1, file2, start, size = args
-
-    with open(file1, "rb") as f1, open(file2, "rb") as f2:
-        f1.seek(start)
-        f2.seek(start)
-
-        data1 = f1.read(size)
-        data2 = f2.read(size)
-
-        return data1 == data2
-
-
-def parallel_compare(file1, file2, chunk_size_bytes):
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from mapped import compare_chunk, map_files
+
+MB = 1024 * 1024
+
+# Chunk sizes probed by tune_chunk_size, and its time budget in seconds
+PROBE_SIZES = (1 * MB, 8 * MB, 64 * MB, 256 * MB)
+PROBE_BUDGET = 0.2
+DEFAULT_CHUNK_SIZE = 8 * MB
+
+
+def tuned_cache_path():
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or \
+        os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_dir, "dnacmp_tuned.json")
+
+
+def probes_fitting(file_size):
+    # How many of PROBE_SIZES fit back to back in a file of this size
+    count = offset = 0
+    for size in PROBE_SIZES:
+        offset += size
+        if offset > file_size:
+            break
+        count += 1
+    return count
+
+
+def probe_throughput(path, file_size):
+    # Read consecutive, uncached ranges of growing size and time each one.
+    # Stops at the end of the file, or before a probe that the last rate
+    # says would overrun the time budget.
+    rates = {}
+    offset = 0
+    rate = None
+
+    sizes = PROBE_SIZES[:probes_fitting(file_size)]
+    if not sizes:
+        return rates
+
+    # One buffer reused by every probe. Anonymous mmap pages are zeroed
+    # lazily, so sizing it for the largest probe costs nothing up front.
+    buf = mmap.mmap(-1, max(sizes))
+    deadline = time.perf_counter() + PROBE_BUDGET
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        for size in sizes:
+            if rate is not None and \
+                    time.perf_counter() + size / rate > deadline:
+                break
+
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, offset, size, os.POSIX_FADV_DONTNEED)
+
+            start = time.perf_counter()
+            if hasattr(os, "preadv"):
+                with memoryview(buf) as view:
+                    read = os.preadv(fd, [view[:size]], offset)
+            else:
+                read = len(os.pread(fd, size, offset))
+            rate = read / (time.perf_counter() - start)
+
+            rates[size] = rate
+            offset += size
+    finally:
+        os.close(fd)
+        buf.close()
+
+    return rates
+
+
+def tune_chunk_size(path):
+    st = os.stat(path)
+    key = str(st.st_dev)
+    cache_path = tuned_cache_path()
+    fitting = probes_fitting(st.st_size)
+
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    # An entry records how many probes its file allowed; a larger file may
+    # reach the bigger sizes, so it probes again instead of reusing it.
+    entry = cache.get(key)
+    if isinstance(entry, dict) and entry.get("probes", 0) >= fitting:
+        chunk_size = entry["chunk_size"]
+    else:
+        rates = probe_throughput(path, st.st_size)
+
+        if len(rates) < 2:
+            chunk_size = DEFAULT_CHUNK_SIZE  # file too small to tell
+        else:
+            # The knee: smallest chunk within 90% of the peak throughput
+            peak = max(rates.values())
+            chunk_size = min(size for size, rate in rates.items()
+                             if rate >= 0.9 * peak)
+
+        # Stopped by the time budget, a bigger file would not probe further
+        probes = fitting if len(rates) == fitting else len(PROBE_SIZES)
+
+        cache[key] = {"chunk_size": chunk_size, "probes": probes}
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, "w") as f:
+                json.dump(cache, f)
+        except OSError:
+            pass  # tuning still applies to this run
+
+    # Keep at least one chunk per core, in whole MB for page alignment
+    cores = os.cpu_count() or 1
+    per_core = -(-st.st_size // (cores * MB)) * MB
+    return max(MB, min(chunk_size, per_core))
+
+
+def parallel_compare(file1, file2, chunk_size_bytes=None):
     size1 = os.path.getsize(file1)
     size2 = os.path.getsize(file2)
 
     if size1 != size2:
         return False
 
-    tasks = []
-    for start in range(0, size1, chunk_size_bytes):
-        remaining = min(chunk_size_bytes, size1 - start)
-        tasks.append((file1, file2, start, remaining))
+    if size1 == 0:
+        return True  # mmap cannot map empty files
+
+    if chunk_size_bytes is None:
+        chunk_size_bytes = tune_chunk_size(file1)
+
+    mismatch = threading.Event()
+
+    # Map both files once; every thread compares offsets into the same
+    # mappings, so there is no fork, pickling or per-task open. The pool
+    # joins every thread before the mappings are released.
+    with map_files(file1, file2) as (maps, addrs), \
+            ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = []
+        for start in range(0, size1, chunk_size_bytes):
+            remaining = min(chunk_size_bytes, size1 - start)
+            futures.append(pool.submit(compare_chunk, maps, addrs,
+                                       mismatch, start, remaining))
 
-    with Pool(processes=cpu_count()) as pool:
-        results = pool.map(compare_chunk, tasks)
+        for future in as_completed(futures):
+            if not future.result():
+                for pending in futures:
+                    pending.cancel()
+                return False
 
-    return all(results)
+    return True
 
 
 def main():
@@ -59,11 +183,14 @@ def main():
     file1 = sys.argv[1]
     file2 = sys.argv[2]
 
-    chunk_size_mb = 8
+    chunk_size_bytes = None
     if len(sys.argv) >= 4:
-        chunk_size_mb = int(sys.argv[3])
+        chunk_size_bytes = int(sys.argv[3]) * MB
 
-    chunk_size_bytes = chunk_size_mb * 1024 * 1024
+    # Calibrate before the timer starts; the probe also evicts part of file 1
+    tuned = chunk_size_bytes is None
+    if tuned:
+        chunk_size_bytes = tune_chunk_size(file1)
 
     start_time = time.perf_counter()
     equal = parallel_compare(file1, file2, chunk_size_bytes)
@@ -74,8 +201,9 @@ def main():
     print("----------------------------------------")
     print(f"File 1: {file1}")
     print(f"File 2: {file2}")
-    print(f"Chunk Size: {chunk_size_mb} MB")
-    print(f"CPU Cores Used: {cpu_count()}")
+    print(f"Chunk Size: {chunk_size_bytes // MB} MB"
+          f"{' (auto-tuned)' if tuned else ''}")
+    print(f"Worker Threads: {os.cpu_count()}")
     print("----------------------------------------")
     print(f"Result: {'EQUAL' if equal else 'NOT EQUAL'}")
     print(f"Time Elapsed: {end_time - start_time:.6f} seconds")
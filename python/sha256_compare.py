@@ -15,22 +15,51 @@ Default chunk size: 8 MB
 """
 
 import hashlib
+import mmap
 import os
 import sys
 import time
 
+from mapped import libc, mapped_address
 
-def sha256_file(path, chunk_size_bytes):
-    sha = hashlib.sha256()
 
-    with open(path, "rb") as f:
-        while True:
-            data = f.read(chunk_size_bytes)
-            if not data:
-                break
-            sha.update(data)
+def compare_and_hash(file1, file2, chunk_size_bytes):
+    # Equality needs no digest: stream both files in lock-step, compare each
+    # window and hash only file 1's side of it. Returns (equal, digest), with
+    # digest None when a mismatch stopped the pass early.
+    size = os.path.getsize(file1)
 
-    return sha.hexdigest()
+    # memcmp below reads size bytes of file 2 too, so it must be that long
+    if os.path.getsize(file2) != size:
+        return False, None
+
+    if size == 0:
+        # mmap cannot map empty files
+        return True, hashlib.sha256(b"").hexdigest()
+
+    sha = hashlib.sha256(usedforsecurity=False)
+
+    # Windows are hashed through a memoryview, so nothing is copied
+    with open(file1, "rb") as f1, open(file2, "rb") as f2, \
+            mmap.mmap(f1.fileno(), 0, access=mmap.ACCESS_READ) as mm1, \
+            mmap.mmap(f2.fileno(), 0, access=mmap.ACCESS_READ) as mm2, \
+            memoryview(mm1) as view1, \
+            mapped_address(mm1) as addr1, mapped_address(mm2) as addr2:
+        for start in range(0, size, chunk_size_bytes):
+            end = min(start + chunk_size_bytes, size)
+
+            if libc is not None:
+                equal = libc.memcmp(addr1 + start, addr2 + start,
+                                    end - start) == 0
+            else:
+                equal = mm1[start:end] == mm2[start:end]
+
+            if not equal:
+                return False, None
+
+            sha.update(view1[start:end])
+
+    return True, sha.hexdigest()
 
 
 def main():
@@ -64,13 +93,10 @@ def main():
 
     start_time = time.perf_counter()
 
-    hash1 = sha256_file(file1, chunk_size_bytes)
-    hash2 = sha256_file(file2, chunk_size_bytes)
+    equal, digest = compare_and_hash(file1, file2, chunk_size_bytes)
 
     end_time = time.perf_counter()
 
-    equal = (hash1 == hash2)
-
     print("========================================")
     print("DNA Sequence Comparator")
     print("----------------------------------------")
@@ -78,8 +104,11 @@ def main():
     print(f"File 2: {file2}")
     print(f"Chunk Size: {chunk_size_mb} MB")
     print("----------------------------------------")
-    print(f"SHA-256 File 1: {hash1}")
-    print(f"SHA-256 File 2: {hash2}")
+    if equal:
+        print(f"SHA-256 File 1: {digest}")
+        print(f"SHA-256 File 2: {digest}")
+    else:
+        print("SHA-256: not computed (contents differ)")
     print("----------------------------------------")
     print(f"Result: {'EQUAL' if equal else 'NOT EQUAL'}")
     print(f"Time Elapsed: {end_time - start_time:.6f} seconds")